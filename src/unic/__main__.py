@@ -1,58 +1,139 @@
 import argparse
+import hashlib
+import heapq
+import io
+import itertools
 import os
-import platform
 import subprocess
 import sys
+import tarfile
+import threading
+import time
+import shutil
 import shlex  # Used to split command strings into args
 import re     # Used for parsing Valgrind output
+import selectors
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 from colorama import Fore, Style, init
-from pyfiglet import Figlet
-
-# Initialize colorama
-init(autoreset=True)
-
-parser = argparse.ArgumentParser(
-    description="A simple program to help university students manage their coursework. Given 2 executable files, it will run them and compare their outputs with the given input file/s."
-)
-
-parser.add_argument("exec1", help="Path to the first executable file (can include args in quotes, e.g. './prog 10').")
-parser.add_argument("exec2", help="Path to the second executable file (can include args in quotes).")
-parser.add_argument(
-    "--files",
-    "-f",
-    nargs="+",
-    help="List of input files to test the executables with.",
-    required=True,
-)
-parser.add_argument(
-    "--max-depth",
-    "-d",
-    type=int,
-    default=5,
-    help="Maximum directory depth for recursive search (default: 5)",
-)
-parser.add_argument(
-    "--output",
-    "-o",
-    type=str,
-    default="uniTestResults",
-    help="Directory to save results (default: uniTestResults)",
-)
-parser.add_argument(
-    "--valgrind",
-    "-v",
-    action="store_true",
-    help="Run executables with Valgrind to check for memory leaks/errors.",
-)
-parser.add_argument(
-    "--timeout",
-    "-t",
-    type=float,
-    default=2.0,
-    help="Timeout in seconds for each test execution (default: 2.0)",
-)
+
+# "UniCompare" pre-rendered in figlet's "slant" font, so startup doesn't
+# have to load a font file and render it
+BANNER = r"""
+   __  __      _ ______
+  / / / /___  (_) ____/___  ____ ___  ____  ____ _________
+ / / / / __ \/ / /   / __ \/ __ `__ \/ __ \/ __ `/ ___/ _ \
+/ /_/ / / / / / /___/ /_/ / / / / / / /_/ / /_/ / /  /  __/
+\____/_/ /_/_/\____/\____/_/ /_/ /_/ .___/\__,_/_/   \___/
+                                  /_/
+"""
+
+# Buffer size for the pipes to/from the executables; coursework stress tests
+# can print megabytes, so read them in large chunks
+PIPE_BUFFER_SIZE = 1024 * 1024
+
+# From this many --jobs on (POSIX only), tests run on one selector loop
+# (TestRunner) instead of a thread pool
+SELECTOR_MIN_JOBS = 32
+
+# Colored prefixes for the per-test status lines, built once rather than
+# looked up and concatenated for every result printed
+RESET = Style.RESET_ALL
+PASS_PREFIX = f"{Fore.GREEN}[✓] "
+FAIL_PREFIX = f"{Fore.RED}[✗] "
+MEMORY_PREFIX = f"{Fore.MAGENTA}[M] "
+MEMORY_DETAIL_PREFIX = f"    {Fore.MAGENTA}↳ "
+TIMEOUT_PREFIX = f"{Fore.YELLOW}[T] "
+
+# Valgrind options used when --valgrind is given (after the resolved
+# valgrind path, before the command)
+VALGRIND_ARGS = ["--leak-check=full", "--quiet"]
+
+# Valgrind's "ERROR SUMMARY: <n> errors from <m> contexts" line
+VALGRIND_ERROR_SUMMARY = re.compile(rb"ERROR SUMMARY: (\d+) errors")
+
+# Anything but letters, digits and " .-_" is replaced in result file names
+UNSAFE_FILENAME_CHARS = re.compile(r"[^\w .-]")
+
+# On POSIX paths have no drive and a single separator, so basenames and
+# result paths can be taken with plain string operations
+_POSIX_PATHS = os.sep == "/" and os.altsep is None
+
+# Platform checks are fixed for the whole run, so they're made once here
+_IS_WINDOWS = sys.platform == "win32"
+_BCOMP_BIN = "bcomp.exe" if _IS_WINDOWS else "bcompare"  # Linux and macOS: bcompare
+
+# Tests run in worker threads, so status lines must not interleave
+print_lock = threading.Lock()
+
+def _build_parser():
+    """Builds the command-line parser (only when main() actually runs)."""
+    parser = argparse.ArgumentParser(
+        description="A simple program to help university students manage their coursework. Given 2 executable files, it will run them and compare their outputs with the given input file/s."
+    )
+
+    parser.add_argument("exec1", help="Path to the first executable file (can include args in quotes, e.g. './prog 10').")
+    parser.add_argument("exec2", help="Path to the second executable file (can include args in quotes).")
+    parser.add_argument(
+        "--files",
+        "-f",
+        nargs="+",
+        help="List of input files to test the executables with.",
+        required=True,
+    )
+    parser.add_argument(
+        "--max-depth",
+        "-d",
+        type=int,
+        default=5,
+        help="Maximum directory depth for recursive search (default: 5)",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        default="uniTestResults",
+        help="Directory to save results (default: uniTestResults)",
+    )
+    parser.add_argument(
+        "--valgrind",
+        "-v",
+        action="store_true",
+        help="Run executables with Valgrind to check for memory leaks/errors.",
+    )
+    parser.add_argument(
+        "--timeout",
+        "-t",
+        type=float,
+        default=2.0,
+        help="Timeout in seconds for each test execution (default: 2.0)",
+    )
+    parser.add_argument(
+        "--save-full",
+        action="store_true",
+        help="On a mismatch, let both programs finish and save their full output (default: stop both at the first difference).",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of tests to run in parallel (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--no-banner",
+        action="store_true",
+        help="Don't print the startup banner (useful for scripted runs).",
+    )
+    return parser
+
+
+def locked_print(*args, **kwargs):
+    """Thread-safe print for output produced by parallel test workers."""
+    with print_lock:
+        print(*args, **kwargs)
 
 def get_safe_results_path(input_file, base_output_dir):
     """
@@ -61,6 +142,9 @@ def get_safe_results_path(input_file, base_output_dir):
     """
     # Normalize path and handle drive letters
     abs_path = os.path.abspath(input_file)
+    if _POSIX_PATHS:
+        return os.path.join(base_output_dir, abs_path.lstrip("/"))
+
     drive, path_no_drive = os.path.splitdrive(abs_path)
     
     # Remove leading separator to ensure os.path.join treats it as relative
@@ -74,195 +158,537 @@ def get_safe_results_path(input_file, base_output_dir):
 
 def check_valgrind_errors(stderr_output):
     """
-    Parses Valgrind stderr output to determine if there were memory errors.
-    Returns True if errors/leaks were found.
+    Parses Valgrind stderr output (bytes) to determine if there were memory
+    errors. Returns True if errors/leaks were found.
     """
     if not stderr_output:
         return False
     
-    # Look for the error summary line
+    # Look for the error summary line; the plain substring test is much
+    # cheaper than the regex, so it guards the search
     # Example: "ERROR SUMMARY: 0 errors from 0 contexts"
-    match = re.search(r"ERROR SUMMARY: (\d+) errors", stderr_output)
-    if match:
-        error_count = int(match.group(1))
-        if error_count > 0:
+    if b"ERROR SUMMARY:" in stderr_output:
+        match = VALGRIND_ERROR_SUMMARY.search(stderr_output)
+        if match and int(match.group(1)) > 0:
             return True
             
     # Also check for "definitely lost" bytes just in case
-    if "definitely lost: 0 bytes" not in stderr_output and "definitely lost:" in stderr_output:
+    lost_at = stderr_output.find(b"definitely lost:")
+    if lost_at != -1 and not stderr_output.startswith(b" 0 bytes", lost_at + len(b"definitely lost:")):
          return True
          
     return False
 
-def process_file(input_file, exec1_cmd, exec2_cmd, display_name=None, use_valgrind=False, timeout=5.0):
+def spawn_executable(cmd, capture_stderr=True):
     """
-    Runs both programs with the given input file and compares their output.
-    Also runs Valgrind if requested.
+    Starts a command with stdin and stdout piped. stderr is piped only if
+    capture_stderr (it's only read for Valgrind reports); otherwise the
+    kernel discards it.
+    Keep the Popen arguments minimal: no preexec_fn, cwd, new session or
+    process_group, so CPython can start the child with vfork/posix_spawn
+    instead of a full fork. Commands should use absolute paths (see
+    build_command) so the exec doesn't search $PATH.
     """
-    
-    # Parse the command strings into executable and arguments
+    return subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE if capture_stderr else subprocess.DEVNULL,
+        bufsize=PIPE_BUFFER_SIZE,
+    )
+
+class OutputComparator:
+    """
+    Compares the stdout of the two executables while they are still running.
+    Bytes both outputs agree on are stored only once; after the first
+    difference each side keeps what it reads on its own. on_mismatch is
+    called once, as soon as a difference is found (e.g. to stop both runs).
+    """
+
+    def __init__(self, on_mismatch=None):
+        self.lock = threading.Lock()
+        self.on_mismatch = on_mismatch
+        self.common = []
+        # Bytes a side has read beyond what the other side has confirmed
+        self.ahead = [bytearray(), bytearray()]
+        self.finished = [False, False]
+        self.mismatch = False
+
+    def _found_mismatch(self):
+        if not self.mismatch:
+            self.mismatch = True
+            if self.on_mismatch:
+                self.on_mismatch()
+
+    def feed(self, side, chunk):
+        """Adds a chunk read from the stdout of executable `side` (0 or 1)."""
+        with self.lock:
+            if not self.mismatch:
+                lead = self.ahead[1 - side]
+                n = min(len(chunk), len(lead))
+                if n:
+                    if lead[:n] != chunk[:n]:
+                        self._found_mismatch()
+                    else:
+                        self.common.append(chunk[:n])
+                        del lead[:n]
+                        chunk = chunk[n:]
+                # The other output already ended, so this one is longer
+                if chunk and self.finished[1 - side]:
+                    self._found_mismatch()
+            self.ahead[side] += chunk
+
+    def finish(self, side):
+        """Marks the stdout of executable `side` as fully read."""
+        with self.lock:
+            self.finished[side] = True
+            # Whatever the other side read past this point makes it longer
+            if self.ahead[1 - side]:
+                self._found_mismatch()
+
+    def matches(self):
+        """True if both outputs ended and were identical."""
+        with self.lock:
+            return (not self.mismatch and all(self.finished)
+                    and not self.ahead[0] and not self.ahead[1])
+
+    def output(self, side):
+        """Everything read so far from executable `side`, as bytes."""
+        with self.lock:
+            return b"".join(self.common + [self.ahead[side]])
+
+def start_executables(cmd1, cmd2, use_valgrind=False, save_full=False):
+    """
+    Starts both commands, before waiting on either, so they run side by side,
+    and creates the comparator for their outputs.
+    Returns ((proc1, proc2), comparator). If a command fails to start,
+    anything already started is stopped and the error is re-raised.
+    """
+    procs = []
     try:
-        exec1_parts = shlex.split(exec1_cmd)
-        exec2_parts = shlex.split(exec2_cmd)
-    except Exception as e:
-        print(f"{Fore.RED}Error parsing command arguments: {e}{Style.RESET_ALL}")
-        return False, None
+        for cmd in (cmd1, cmd2):
+            procs.append(spawn_executable(cmd, use_valgrind))
+    except Exception:
+        # The first process may already be running if only the second failed
+        for proc in procs:
+            proc.kill()
+            proc.wait()
+            for pipe in (proc.stdin, proc.stdout, proc.stderr):
+                if pipe is not None:
+                    pipe.close()
+        raise
+
+    def stop_both():
+        for proc in procs:
+            proc.kill()
+
+    # Unless full outputs were asked for, the first difference settles
+    # the test, so both programs are stopped right there
+    comparator = OutputComparator(on_mismatch=None if save_full else stop_both)
+    return tuple(procs), comparator
+
+def collect_output(proc, input_data, timeout, comparator, side):
+    """
+    Feeds input to a running process and streams its stdout into the
+    comparator as executable `side` while it runs.
+    Returns (stderr, timed_out), with stderr b"" if it wasn't piped; on
+    timeout the process is killed and whatever it printed so far stays in
+    the comparator.
+    """
+    stderr_chunks = []
 
-    # Get absolute paths for the executables
-    exec1_path = os.path.abspath(exec1_parts[0])
-    exec2_path = os.path.abspath(exec2_parts[0])
+    def feed_stdin():
+        try:
+            with proc.stdin:
+                proc.stdin.write(input_data)
+        except OSError:
+            # The program exited (or closed stdin) without reading everything
+            pass
 
-    # Construct the final command lists
-    cmd1 = [exec1_path] + exec1_parts[1:]
-    cmd2 = [exec2_path] + exec2_parts[1:]
+    def read_stdout():
+        with proc.stdout:
+            while True:
+                chunk = proc.stdout.read1(PIPE_BUFFER_SIZE)
+                if not chunk:
+                    break
+                comparator.feed(side, chunk)
+        comparator.finish(side)
 
-    # Add Valgrind wrapper if requested
-    if use_valgrind:
-        valgrind_prefix = ["valgrind", "--leak-check=full", "--quiet"]
-        cmd1 = valgrind_prefix + cmd1
-        cmd2 = valgrind_prefix + cmd2
+    def read_stderr():
+        with proc.stderr:
+            stderr_chunks.append(proc.stderr.read())
 
-    display_text = display_name if display_name else input_file
+    readers = [threading.Thread(target=read_stdout, daemon=True)]
+    if proc.stderr is not None:
+        readers.append(threading.Thread(target=read_stderr, daemon=True))
+    threads = [threading.Thread(target=feed_stdin, daemon=True)] + readers
+    for thread in threads:
+        thread.start()
 
-    # Read input file
+    deadline = time.monotonic() + timeout
+    timed_out = False
     try:
-        with open(input_file, "r") as f:
-            input_data = f.read()
-    except IOError as e:
-        print(
-            f"{Fore.RED}Error reading input file {display_text}: {e}{Style.RESET_ALL}"
-        )
-        return False, None
+        proc.wait(timeout=timeout)
+        # Pipes may outlive the process if it left children holding them
+        for thread in readers:
+            thread.join(max(0, deadline - time.monotonic()))
+            if thread.is_alive():
+                timed_out = True
+    except subprocess.TimeoutExpired:
+        timed_out = True
 
-    # Run executables
-    output1 = ""
-    stderr1 = ""
-    output2 = ""
-    stderr2 = ""
-    timed_out = False
+    if timed_out:
+        proc.kill()
+        proc.wait()
+
+    return b"".join(stderr_chunks), timed_out
+
+def build_command(cmd_str, valgrind_prefix=None):
+    """
+    Splits a command string into an argument list with an absolute path
+    to the executable, prefixed with valgrind_prefix (the resolved Valgrind
+    path plus VALGRIND_ARGS) if given.
+    Called once per executable, not once per test; raises ValueError if
+    the string can't be parsed.
+    """
+    parts = shlex.split(cmd_str)
+    if not parts:
+        raise ValueError("empty command")
+
+    cmd = [os.path.abspath(parts[0])] + parts[1:]
+    if valgrind_prefix:
+        cmd = valgrind_prefix + cmd
+    return cmd
+
+def clean_filename(cmd_str):
+    """Turns a command string into a name usable for result files."""
+    name = os.path.basename(cmd_str)
+    name = name.replace(".exe", "")
+    return UNSAFE_FILENAME_CHARS.sub("_", name)
+
+def process_file(input_data, cmd1, cmd2, use_valgrind=False, timeout=5.0, save_full=False):
+    """
+    Runs both commands (argument lists from build_command) with the given
+    input (bytes) and compares their output. Returns (success, result_data);
+    report_result() prints the outcome.
+    use_valgrind must match how the commands were built; it enables the
+    Valgrind report checks. Without save_full both programs are stopped at
+    the first difference, so a mismatch only keeps output up to that point.
+    """
 
-    def safe_decode(data):
-        """Helper to safely ensure data is string"""
-        if data is None:
-            return ""
-        if isinstance(data, bytes):
-            return data.decode('utf-8', errors='replace')
-        return data
+    # Run executables
+    procs = ()
 
     try:
-        # --- Run Executable 1 ---
-        try:
-            proc1 = subprocess.Popen(
-                cmd1,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-            )
-            output1, stderr1 = proc1.communicate(input=input_data, timeout=timeout)
-        except subprocess.TimeoutExpired as e:
-            proc1.kill()
-            # Capture partial output and ensure it is decoded
-            output1 = safe_decode(e.stdout)
-            stderr1 = safe_decode(e.stderr)
-            timed_out = True
-        
-        # --- Run Executable 2 ---
+        procs, comparator = start_executables(cmd1, cmd2, use_valgrind, save_full)
+        proc1, proc2 = procs
+
+        # collect_output() blocks, so proc1 is collected on a helper thread
+        # while this thread collects proc2
+        results = {}
+
+        def collect_first():
+            results["proc1"] = collect_output(proc1, input_data, timeout, comparator, 0)
+
+        collector = threading.Thread(target=collect_first)
+        collector.start()
         try:
-            proc2 = subprocess.Popen(
-                cmd2,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-            )
-            output2, stderr2 = proc2.communicate(input=input_data, timeout=timeout)
-        except subprocess.TimeoutExpired as e:
-            proc2.kill()
-            # Capture partial output and ensure it is decoded
-            output2 = safe_decode(e.stdout)
-            stderr2 = safe_decode(e.stderr)
-            timed_out = True
+            stderr2, timed_out2 = collect_output(proc2, input_data, timeout, comparator, 1)
+        finally:
+            collector.join()
+
+        if "proc1" not in results:
+            raise RuntimeError("collecting output of the first executable failed")
+        stderr1, timed_out1 = results["proc1"]
+
+        timed_out = timed_out1 or timed_out2
 
-    except FileNotFoundError:
-        if use_valgrind:
-             print(f"{Fore.RED}Error: 'valgrind' not found. Please install it or remove the --valgrind flag.{Style.RESET_ALL}")
-        else:
-             print(f"{Fore.RED}Error running executables. Check paths.{Style.RESET_ALL}")
-        return False, None
     except Exception as e:
-        print(f"{Fore.RED}Error running executables: {e}{Style.RESET_ALL}")
+        # A failed start was already cleaned up by start_executables()
+        for proc in procs:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+        print_run_error(e)
         return False, None
 
+    return build_result(comparator, stderr1, stderr2, timed_out, use_valgrind)
+
+
+def print_run_error(error):
+    """Reports an exception raised while starting or running the executables."""
+    if isinstance(error, FileNotFoundError):
+        locked_print(f"{Fore.RED}Error running executables. Check paths.{Style.RESET_ALL}")
+    else:
+        locked_print(f"{Fore.RED}Error running executables: {error}{Style.RESET_ALL}")
+
+
+def build_result(comparator, stderr1, stderr2, timed_out, use_valgrind):
+    """
+    Turns a finished run (comparator plus both stderr outputs) into the
+    (success, result_data) pair process_file() returns.
+    """
+    valgrind_error1 = check_valgrind_errors(stderr1) if use_valgrind else False
+    valgrind_error2 = check_valgrind_errors(stderr2) if use_valgrind else False
+
+    # Logic for Success/Failure
+
+    # Outputs were compared while they streamed in; a passing run's output
+    # is never joined
+    outputs_match = comparator.matches()
+
+    if not timed_out and outputs_match and not (valgrind_error1 or valgrind_error2):
+        return True, None
+
     # Result Data Structure
     result_data = {
-        "output1": output1,
-        "output2": output2,
+        "output1": comparator.output(0),
+        "output2": comparator.output(1),
         "stderr1": stderr1 if use_valgrind else None,
         "stderr2": stderr2 if use_valgrind else None,
-        "valgrind_error1": check_valgrind_errors(stderr1) if use_valgrind else False,
-        "valgrind_error2": check_valgrind_errors(stderr2) if use_valgrind else False
+        "valgrind_error1": valgrind_error1,
+        "valgrind_error2": valgrind_error2,
+        "timed_out": timed_out,
+        "outputs_match": outputs_match,
     }
+    return False, result_data
+
+
+def report_result(display_name, success, result_data):
+    """Prints the status line(s) for one test result from process_file()."""
+    if success:
+        locked_print(f"{PASS_PREFIX}{display_name}{RESET}")
+        return
+
+    # The run itself failed; process_file() already printed why
+    if result_data is None:
+        return
 
-    # Logic for Success/Failure
-    
     # 0. Timeout (New priority) - Treat as mismatch so we can see partial output
-    if timed_out:
-        print(f"{Fore.YELLOW}[T] {display_text} (Timeout - Saving Partial Output){Style.RESET_ALL}")
-        return False, result_data
+    if result_data["timed_out"]:
+        locked_print(f"{TIMEOUT_PREFIX}{display_name} (Timeout - Saving Partial Output){RESET}")
+        return
 
     # 1. Output Mismatch
-    if output1 != output2:
-        print(f"{Fore.RED}[✗] {display_text} (Output Mismatch){Style.RESET_ALL}")
-        return False, result_data
+    if not result_data["outputs_match"]:
+        locked_print(f"{FAIL_PREFIX}{display_name} (Output Mismatch){RESET}")
+        return
 
-    # 2. Valgrind Memory Errors (only if enabled)
-    if use_valgrind:
-        if result_data["valgrind_error1"] or result_data["valgrind_error2"]:
-            print(f"{Fore.MAGENTA}[M] {display_text} (Memory Error){Style.RESET_ALL}")
-            if result_data["valgrind_error1"]:
-                 print(f"    {Fore.MAGENTA}↳ Memory leaks in Exec 1{Style.RESET_ALL}")
-            if result_data["valgrind_error2"]:
-                 print(f"    {Fore.MAGENTA}↳ Memory leaks in Exec 2{Style.RESET_ALL}")
-            return False, result_data
+    # 2. Valgrind Memory Errors (the only failure left at this point)
+    lines = [f"{MEMORY_PREFIX}{display_name} (Memory Error){RESET}"]
+    if result_data["valgrind_error1"]:
+         lines.append(f"{MEMORY_DETAIL_PREFIX}Memory leaks in Exec 1{RESET}")
+    if result_data["valgrind_error2"]:
+         lines.append(f"{MEMORY_DETAIL_PREFIX}Memory leaks in Exec 2{RESET}")
+    locked_print("\n".join(lines))
 
-    # 3. Success
-    print(f"{Fore.GREEN}[✓] {display_text}{Style.RESET_ALL}")
-    return True, result_data
 
+class TestRunner:
+    """
+    Runs tests from a single thread, multiplexing the pipes of every running
+    executable with one selector (epoll on Linux) instead of three threads
+    per process. Used for large --jobs values; POSIX only, since Windows
+    can't poll pipes.
+    """
 
-def save_mismatched_outputs(input_file, result_data, exec1_cmd, exec2_cmd, base_output_dir):
-    """Save outputs (and Valgrind logs) for failed tests."""
-    try:
-        results_dir = get_safe_results_path(input_file, base_output_dir)
-        Path(results_dir).mkdir(parents=True, exist_ok=True)
+    def __init__(self, cmd1, cmd2, use_valgrind=False, timeout=5.0, save_full=False):
+        self.cmds = (cmd1, cmd2)
+        self.use_valgrind = use_valgrind
+        self.timeout = timeout
+        self.save_full = save_full
+        self.selector = selectors.DefaultSelector()
+        # (deadline, seq, test) for every running test; finished tests are
+        # skipped when they come up instead of being removed
+        self.deadlines = []
+        self.seq = itertools.count()
+        # Tests whose pipes are all closed but whose processes haven't
+        # exited, keyed by id(test)
+        self.exiting = {}
+        self.running = 0
+        self.finished = []
+
+    def run(self, tests, jobs):
+        """
+        Runs (key, input_data) pairs from tests, at most `jobs` at a time.
+        Yields (key, success, result_data) as each test finishes.
+        """
+        pending = iter(tests)
+        more = True
+
+        with self.selector:
+            while True:
+                while more and self.running < jobs:
+                    test = next(pending, None)
+                    if test is None:
+                        more = False
+                    else:
+                        self.submit(*test)
+
+                yield from self.finished
+                self.finished.clear()
+
+                if not more and not self.running:
+                    return
+                self.poll()
+
+    def submit(self, key, input_data):
+        """Starts both executables for one test and registers their pipes."""
+        try:
+            procs, comparator = start_executables(*self.cmds, self.use_valgrind, self.save_full)
+        except Exception as e:
+            print_run_error(e)
+            self.finished.append((key, False, None))
+            return
 
-        def clean_filename(cmd_str):
-            name = os.path.basename(cmd_str)
-            name = name.replace(".exe", "")
-            return "".join(c if c.isalnum() or c in " .-_" else "_" for c in name)
+        test = {
+            "key": key,
+            "procs": procs,
+            "comparator": comparator,
+            "input": memoryview(input_data),
+            "written": [0, 0],
+            "stderr": [[], []],
+            "pipes": set(),
+            "timed_out": False,
+            "done": False,
+        }
+
+        for side, proc in enumerate(procs):
+            for pipe, events in ((proc.stdin, selectors.EVENT_WRITE),
+                                 (proc.stdout, selectors.EVENT_READ),
+                                 (proc.stderr, selectors.EVENT_READ)):
+                if pipe is None:
+                    continue
+                os.set_blocking(pipe.fileno(), False)
+                self.selector.register(pipe, events, (test, side))
+                test["pipes"].add(pipe)
+
+        self.running += 1
+        heapq.heappush(self.deadlines, (time.monotonic() + self.timeout, next(self.seq), test))
+
+    def poll(self):
+        """Waits for pipe activity or the next deadline and handles it."""
+        timeout = None
+        if self.deadlines:
+            timeout = max(0, self.deadlines[0][0] - time.monotonic())
+        if self.exiting:
+            # Exits aren't visible to the selector, so check back shortly
+            timeout = 0.01 if timeout is None else min(timeout, 0.01)
+
+        for selector_key, _ in self.selector.select(timeout):
+            test, side = selector_key.data
+            pipe = selector_key.fileobj
+            if pipe not in test["pipes"]:
+                continue
+            if pipe is test["procs"][side].stdin:
+                self._write(test, side, pipe)
+            else:
+                self._read(test, side, pipe)
+
+        for test_id, test in list(self.exiting.items()):
+            if all(proc.poll() is not None for proc in test["procs"]):
+                del self.exiting[test_id]
+                self._finish(test)
+
+        now = time.monotonic()
+        while self.deadlines and self.deadlines[0][0] <= now:
+            _, _, test = heapq.heappop(self.deadlines)
+            if not test["done"]:
+                # Kill both; whatever they printed so far stays in the comparator
+                test["timed_out"] = True
+                for proc in test["procs"]:
+                    proc.kill()
+                for pipe in list(test["pipes"]):
+                    self._close(test, pipe)
+                if self.exiting.pop(id(test), None) is not None:
+                    self._finish(test)
+
+    def _write(self, test, side, pipe):
+        data = test["input"][test["written"][side]:test["written"][side] + PIPE_BUFFER_SIZE]
+        if data:
+            try:
+                test["written"][side] += os.write(pipe.fileno(), data)
+                return
+            except BlockingIOError:
+                return
+            except OSError:
+                # The program exited (or closed stdin) without reading everything
+                pass
+        self._close(test, pipe)
+
+    def _read(self, test, side, pipe):
+        try:
+            chunk = os.read(pipe.fileno(), PIPE_BUFFER_SIZE)
+        except BlockingIOError:
+            return
+        proc = test["procs"][side]
+        if chunk:
+            if pipe is proc.stdout:
+                test["comparator"].feed(side, chunk)
+            else:
+                test["stderr"][side].append(chunk)
+            return
+        if pipe is proc.stdout:
+            test["comparator"].finish(side)
+        self._close(test, pipe)
 
-        exec1_name = clean_filename(exec1_cmd)
-        exec2_name = clean_filename(exec2_cmd)
+    def _close(self, test, pipe):
+        self.selector.unregister(pipe)
+        test["pipes"].discard(pipe)
+        try:
+            pipe.close()
+        except OSError:
+            pass
+        if not test["pipes"]:
+            # Pipes may close before the process exits, so wait for that too
+            self.exiting[id(test)] = test
+
+    def _finish(self, test):
+        for proc in test["procs"]:
+            proc.wait()
+        test["done"] = True
+        self.running -= 1
+        stderr1, stderr2 = (b"".join(chunks) for chunks in test["stderr"])
+        self.finished.append(
+            (test["key"], *build_result(test["comparator"], stderr1, stderr2, test["timed_out"], self.use_valgrind))
+        )
+        # The test stays in self.deadlines until its deadline passes, so
+        # drop everything large now rather than holding it until then
+        del test["comparator"]
+        test["input"] = None
+        test["stderr"] = None
+
+
+def save_mismatched_outputs(input_file, result_data, exec1_name, exec2_name, results_archive):
+    """
+    Save outputs (and Valgrind logs) for failed tests into a single tar
+    archive, results_archive (get_safe_results_path() + ".tar").
+    exec1_name/exec2_name are the clean_filename() forms of the commands.
+    """
+    # One file per failed test instead of a folder of 2-4 small ones keeps
+    # large runs from churning through directory entries and inodes
+    artifacts = [
+        (f"{exec1_name}_output.txt", result_data["output1"]),
+        (f"{exec2_name}_output.txt", result_data["output2"]),
+    ]
 
-        # Save Standard Outputs
-        with open(os.path.join(results_dir, f"{exec1_name}_output.txt"), "w") as f:
-            f.write(result_data["output1"])
+    # Save Valgrind Logs if they exist (raw bytes, as Valgrind wrote them)
+    if result_data["stderr1"]:
+        artifacts.append((f"{exec1_name}_valgrind.txt", result_data["stderr1"]))
+    if result_data["stderr2"]:
+        artifacts.append((f"{exec2_name}_valgrind.txt", result_data["stderr2"]))
 
-        with open(os.path.join(results_dir, f"{exec2_name}_output.txt"), "w") as f:
-            f.write(result_data["output2"])
+    try:
+        Path(results_archive).parent.mkdir(parents=True, exist_ok=True)
 
-        # Save Valgrind Logs if they exist
-        if result_data["stderr1"]:
-            with open(os.path.join(results_dir, f"{exec1_name}_valgrind.txt"), "w") as f:
-                f.write(result_data["stderr1"])
-        
-        if result_data["stderr2"]:
-            with open(os.path.join(results_dir, f"{exec2_name}_valgrind.txt"), "w") as f:
-                f.write(result_data["stderr2"])
+        with tarfile.open(results_archive, "w") as archive:
+            for name, data in artifacts:
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                info.mtime = int(time.time())
+                archive.addfile(info, io.BytesIO(data))
 
-    except IOError as e:
-        print(f"{Fore.RED}Error saving results for {input_file}: {e}{Style.RESET_ALL}")
+    except (IOError, tarfile.TarError) as e:
+        locked_print(f"{Fore.RED}Error saving results for {input_file}: {e}{Style.RESET_ALL}")
 
 
 def handle_windows_beyond_compare():
@@ -305,35 +731,37 @@ def handle_linux_beyond_compare():
         return False
 
 
-def open_in_beyond_compare(results_dir):
-    """Open Beyond Compare with the comparison files."""
-    exec1_file = None
-    exec2_file = None
+def open_in_beyond_compare(results_archive, exec1_name, exec2_name):
+    """
+    Open Beyond Compare with the comparison files from a results archive.
+    exec1_name/exec2_name are the names save_mismatched_outputs() used.
+    """
+    # The two output files are extracted into a folder next to the archive
+    # (the archive path without ".tar"), overwriting any earlier copies.
+    # Beyond Compare keeps using them after we return, so they are not removed
+    extract_dir = os.path.splitext(results_archive)[0]
 
-    # Find the two output files (ending in _output.txt)
     try:
-        for file in os.listdir(results_dir):
-            if file.endswith("_output.txt"):
-                if exec1_file is None:
-                    exec1_file = os.path.join(results_dir, file)
-                else:
-                    exec2_file = os.path.join(results_dir, file)
-                    break
+        with tarfile.open(results_archive, "r") as archive:
+            Path(extract_dir).mkdir(exist_ok=True)
+            exec1_file = os.path.join(extract_dir, f"{exec1_name}_output.txt")
+            exec2_file = os.path.join(extract_dir, f"{exec2_name}_output.txt")
+            for file_path in (exec1_file, exec2_file):
+                member = archive.getmember(os.path.basename(file_path))
+                Path(file_path).write_bytes(archive.extractfile(member).read())
     except FileNotFoundError:
-         print(f"{Fore.RED}Error: Results directory not found: {results_dir}{Style.RESET_ALL}")
+         print(f"{Fore.RED}Error: Results archive not found: {results_archive}{Style.RESET_ALL}")
          return
-
-    if not exec1_file or not exec2_file:
+    except KeyError:
         print(
-            f"{Fore.RED}Error: Could not find both output files in {results_dir}{Style.RESET_ALL}"
+            f"{Fore.RED}Error: Could not find both output files in {results_archive}{Style.RESET_ALL}"
         )
         return
+    except (IOError, tarfile.TarError) as e:
+         print(f"{Fore.RED}Error reading results archive {results_archive}: {e}{Style.RESET_ALL}")
+         return
 
-    # Determine the command based on OS
-    if platform.system() == "Windows":
-        cmd = ["bcomp.exe", exec1_file, exec2_file]
-    else:  # Linux and macOS
-        cmd = ["bcompare", exec1_file, exec2_file]
+    cmd = [_BCOMP_BIN, exec1_file, exec2_file]
 
     try:
         subprocess.Popen(cmd)
@@ -342,7 +770,7 @@ def open_in_beyond_compare(results_dir):
             f"{Fore.YELLOW}Beyond Compare not found. Attempting to set up Beyond Compare...{Style.RESET_ALL}"
         )
 
-        if platform.system() == "Windows":
+        if _IS_WINDOWS:
             setup_success = handle_windows_beyond_compare()
         else:
             setup_success = handle_linux_beyond_compare()
@@ -362,52 +790,79 @@ def get_txt_files_recursive(directory, max_depth=5):
     """Recursively find all .txt files up to max_depth directories deep."""
     txt_files = []
 
-    def traverse(path, current_depth):
-        if current_depth > max_depth:
-            return
+    # Explicit stack instead of recursion: no call per directory and no
+    # recursion limit on deep trees
+    stack = [(directory, 1)] if max_depth >= 1 else []
+    while stack:
+        path, current_depth = stack.pop()
+        subdirs = []
 
         try:
-            for item in os.listdir(path):
-                item_path = os.path.join(path, item)
-                if os.path.isfile(item_path) and item.endswith(".txt"):
-                    txt_files.append(item_path)
-                elif os.path.isdir(item_path):
-                    traverse(item_path, current_depth + 1)
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    # DirEntry caches the file type from the directory listing,
+                    # so unlike os.path.isfile/isdir this needs no stat() per entry.
+                    # Only symlinks still need one, so check the name first
+                    if entry.name.endswith(".txt") and entry.is_file():
+                        txt_files.append(entry.path)
+                    elif entry.is_dir() and current_depth < max_depth:
+                        subdirs.append((entry.path, current_depth + 1))
         except PermissionError:
             pass
 
-    traverse(directory, 1)
+        # Reversed so subdirectories are still visited in listing order
+        stack.extend(reversed(subdirs))
+
     return txt_files
 
 
-def interactive_compare_loop(mismatched_files, base_output_dir):
-    """Interactive loop to view mismatches in Beyond Compare."""
-    basename_count = {}
-    file_mapping = {}
+def plan_runs(input_files, max_depth):
+    """
+    Expands input_files (files or directories) into the list of tests to run.
+    Returns a list of (file_path, basename, display_name) tuples, in order.
+    Files sharing a basename get a running "[n]" suffix in their display name.
+    """
+    all_files = []
 
-    for full_path in mismatched_files:
-        basename = os.path.basename(full_path)
-        if basename not in basename_count:
-            basename_count[basename] = 0
-        basename_count[basename] += 1
+    for input_file in input_files:
+        if not os.path.exists(input_file):
+            print(
+                f"{FAIL_PREFIX}{input_file} (FILE/DIRECTORY NOT FOUND){RESET}"
+            )
+            continue
 
-    basename_seen = {}
-    for full_path in mismatched_files:
-        basename = os.path.basename(full_path)
-        
-        # Use the same safe path logic for retrieval
-        results_path = get_safe_results_path(full_path, base_output_dir)
+        if os.path.isdir(input_file):
+            files_to_process = get_txt_files_recursive(input_file, max_depth)
+        else:
+            files_to_process = [input_file]
+
+        if _POSIX_PATHS:
+            all_files.extend((path, path.rpartition("/")[2]) for path in files_to_process)
+        else:
+            all_files.extend((path, os.path.basename(path)) for path in files_to_process)
+
+    basename_count = Counter(basename for _, basename in all_files)
+    basename_indices = defaultdict(int)
+    runs = []
 
+    for file_path, basename in all_files:
         if basename_count[basename] > 1:
-            if basename not in basename_seen:
-                basename_seen[basename] = 0
-            basename_seen[basename] += 1
-            display_name = f"{basename}[{basename_seen[basename]}]"
+            basename_indices[basename] += 1
+            display_name = f"{file_path}[{basename_indices[basename]}]"
         else:
-            display_name = basename
+            display_name = file_path
+
+        runs.append((file_path, basename, display_name))
+
+    return runs
 
-        file_mapping[display_name] = results_path
 
+def interactive_compare_loop(file_mapping):
+    """
+    Interactive loop to view mismatches in Beyond Compare.
+    file_mapping maps each failed test's display name to a
+    (results_archive, exec1_name, exec2_name) tuple.
+    """
     # Sort keys for consistent numbering
     sorted_display_names = sorted(file_mapping.keys())
 
@@ -444,16 +899,55 @@ def interactive_compare_loop(mismatched_files, base_output_dir):
                 print(f"{Fore.RED}Error: '{user_input}' not found.{Style.RESET_ALL}")
                 continue
 
-            results_path = file_mapping[target_name]
-            open_in_beyond_compare(results_path)
+            open_in_beyond_compare(*file_mapping[target_name])
         except KeyboardInterrupt:
             print(f"\n{Fore.YELLOW}Interrupted by user. Exiting...{Style.RESET_ALL}")
             break
         except Exception as e:
             print(f"{Fore.RED}Unexpected error: {e}{Style.RESET_ALL}")
 
+def run_tests(tests, run_test, jobs):
+    """
+    Calls run_test(test) for every entry in tests, using up to `jobs` worker
+    threads. run_test returns a list of (file_path, display_name, success,
+    result_data) tuples, which are yielded as each test finishes.
+    """
+    # A single test (or worker) gains nothing from a pool, so skip setting one up
+    if len(tests) <= 1 or jobs <= 1:
+        for test in tests:
+            yield from run_test(test)
+        return
+
+    # Each test is dominated by waiting on subprocesses, so threads are enough
+    with ThreadPoolExecutor(max_workers=min(jobs, len(tests))) as executor:
+        futures = [executor.submit(run_test, test) for test in tests]
+
+        for future in as_completed(futures):
+            yield from future.result()
+
+def finish_in_background(finished, finish_test):
+    """
+    Calls finish_test(key, success, result_data) for every item of finished
+    on a separate thread, so the selector loop producing them (TestRunner)
+    keeps serving pipes and deadlines while results are reported and saved.
+    Yields the entries of each returned list, in order, as they are ready.
+    """
+    with ThreadPoolExecutor(max_workers=1) as saver:
+        pending = deque()
+        for item in finished:
+            pending.append(saver.submit(finish_test, *item))
+            # Pass on whatever is already saved, without waiting for the rest
+            while pending and pending[0].done():
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+
 def main():
-    args = parser.parse_args()
+    args = _build_parser().parse_args()
+
+    # Initialize colorama (after parsing, so --help and usage errors skip it)
+    init(autoreset=True)
 
     exec1 = args.exec1
     exec2 = args.exec2
@@ -462,13 +956,41 @@ def main():
     output_dir = args.output
     use_valgrind = args.valgrind
     timeout = args.timeout
+    jobs = args.jobs
+    save_full = args.save_full
+
+    # Valgrind is checked for before any test runs. An absolute path also
+    # spares every spawn a $PATH search (one failed exec per directory
+    # before the right one)
+    valgrind_prefix = None
+    if use_valgrind:
+        valgrind_path = shutil.which("valgrind")
+        if valgrind_path is None:
+            print(f"{Fore.RED}Error: 'valgrind' not found. Please install it or remove the --valgrind flag.{Style.RESET_ALL}")
+            sys.exit(1)
+        valgrind_prefix = [valgrind_path] + VALGRIND_ARGS
+
+    # The executables are the same for every test: resolve them once
+    try:
+        cmd1 = build_command(exec1, valgrind_prefix)
+        cmd2 = build_command(exec2, valgrind_prefix)
+    except ValueError as e:
+        print(f"{Fore.RED}Error parsing command arguments: {e}{Style.RESET_ALL}")
+        sys.exit(1)
+
+    exec1_name = clean_filename(exec1)
+    exec2_name = clean_filename(exec2)
+    # e.g. sol/a.out vs mine/a.out: result files are named after these, so
+    # they must not collide
+    if exec1_name == exec2_name:
+        exec1_name += "_1"
+        exec2_name += "_2"
 
     has_output_mismatches = False
-    mismatched_files = []
+    file_mapping = {}
 
-    fig = Figlet(font="slant")
-    banner = fig.renderText("UniCompare")
-    print(f"\n{Fore.CYAN}{Style.BRIGHT}{banner}{Style.RESET_ALL}")
+    if not args.no_banner:
+        print(f"{Fore.CYAN}{Style.BRIGHT}{BANNER}{Style.RESET_ALL}")
 
     description = "A simple program to help university students manage their coursework.\nGiven 2 executable files, it will run them and compare their outputs with the given input file/s."
     print(f"{Fore.YELLOW}{description}{Style.RESET_ALL}")
@@ -484,64 +1006,70 @@ def main():
     )
     print(f"{Style.BRIGHT}{'=' * 60}{Style.RESET_ALL}\n")
 
-    all_files = []
-    basename_count = {}
+    runs = plan_runs(input_files, max_depth)
 
-    for input_file in input_files:
-        if not os.path.exists(input_file):
+    # Read every input once up front; workers then only wait on subprocesses.
+    # Kept as bytes: it is passed through to both children untouched
+    file_bytes = {}
+    for file_path, _, _ in runs:
+        if file_path in file_bytes:
             continue
-
-        if os.path.isdir(input_file):
-            txt_files = get_txt_files_recursive(input_file, max_depth)
-            all_files.extend(txt_files)
-        else:
-            all_files.append(input_file)
-
-    for file_path in all_files:
-        basename = os.path.basename(file_path)
-        basename_count[basename] = basename_count.get(basename, 0) + 1
-
-    basename_indices = {}
-
-    for input_file in input_files:
-        if not os.path.exists(input_file):
+        try:
+            file_bytes[file_path] = Path(file_path).read_bytes()
+        except IOError as e:
+            file_bytes[file_path] = None
             print(
-                f"{Fore.RED}[✗] {input_file} (FILE/DIRECTORY NOT FOUND){Style.RESET_ALL}"
+                f"{Fore.RED}Error reading input file {file_path}: {e}{Style.RESET_ALL}"
             )
-            continue
 
-        files_to_process = []
-        if os.path.isdir(input_file):
-            files_to_process = get_txt_files_recursive(input_file, max_depth)
-        else:
-            files_to_process = [input_file]
-
-        for file_path in files_to_process:
-            basename = os.path.basename(file_path)
-            
-            if basename not in basename_indices:
-                basename_indices[basename] = 0
-            basename_indices[basename] += 1
-
-            if basename_count[basename] > 1:
-                display_name = f"{file_path}[{basename_indices[basename]}]"
-            else:
-                display_name = file_path
+    # Identical inputs give identical results, so each distinct input runs
+    # once and its result is reported for every path that has it
+    tests = {}
+    for file_path, _, display_name in runs:
+        data = file_bytes[file_path]
+        if data is not None:
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            tests.setdefault(digest, []).append((file_path, display_name))
+
+    def finish_test(paths, success, result_data):
+        results = []
+        for file_path, display_name in paths:
+            report_result(display_name, success, result_data)
+            path_result = result_data
+            # Every failed test saves into its own archive, so workers can write in parallel
+            if not success and result_data is not None:
+                # Computed once here; the interactive menu reuses it
+                path_result = dict(result_data, results_archive=get_safe_results_path(file_path, output_dir) + ".tar")
+                save_mismatched_outputs(file_path, path_result, exec1_name, exec2_name, path_result["results_archive"])
+            results.append((file_path, display_name, success, path_result))
+        return results
+
+    def run_test(paths):
+        return finish_test(paths, *process_file(file_bytes[paths[0][0]], cmd1, cmd2, use_valgrind, timeout, save_full))
+
+    groups = list(tests.values())
+    # Past a few dozen parallel tests, three threads per process cost more
+    # than one selector loop over all the pipes (not available on Windows)
+    if not _IS_WINDOWS and jobs >= SELECTOR_MIN_JOBS and len(groups) > 1:
+        runner = TestRunner(cmd1, cmd2, use_valgrind, timeout, save_full)
+        finished = runner.run([(paths, file_bytes[paths[0][0]]) for paths in groups], jobs)
+        results = finish_in_background(finished, finish_test)
+    else:
+        results = run_tests(groups, run_test, jobs)
 
-            success, result_data = process_file(file_path, exec1, exec2, display_name, use_valgrind, timeout)
-            
-            if not success:
-                if result_data is not None:
-                    has_output_mismatches = True
-                    save_mismatched_outputs(file_path, result_data, exec1, exec2, output_dir)
-                    mismatched_files.append(file_path)
+    for file_path, display_name, success, result_data in results:
+        if not success:
+            if result_data is not None:
+                has_output_mismatches = True
+                # Listed under the same name as its status line
+                file_mapping[display_name] = (result_data["results_archive"], exec1_name, exec2_name)
 
     print(f"\n{Style.BRIGHT}{'=' * 60}{Style.RESET_ALL}")
 
     if has_output_mismatches:
         print(f"{Fore.YELLOW}Results saved in {output_dir}/ folder{Style.RESET_ALL}")
         print(f"{Style.BRIGHT}{'=' * 60}{Style.RESET_ALL}")
-        interactive_compare_loop(mismatched_files, output_dir)
+        interactive_compare_loop(file_mapping)
     else:
         print(f"{Fore.GREEN}All tests passed! No mismatches found.{Style.RESET_ALL}")
         print(f"{Style.BRIGHT}{'=' * 60}{Style.RESET_ALL}")